@@ -31,13 +31,175 @@ b) 1
 """
 
 import requests
-import uuid
+import html
+import logging
 import os
 import re
 import argparse
-from typing import List, Dict, Any, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter, Retry
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+try:
+    # orjson serializes the nested item payloads several times faster than
+    # the stdlib encoder; fall back to stdlib json when it is not installed
+    import orjson
+
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    import json
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+try:
+    # re2 runs these patterns in guaranteed linear time (no backtracking)
+    # and is faster on large files; everything _MASTER uses - alternation,
+    # named groups, scoped flags - is re2-compatible. Optional dependency,
+    # stdlib re is the fallback.
+    import re2 as _re
+except ImportError:
+    _re = re
+
+# All text2qti line kinds combined into one alternation, compiled once at
+# import time. A line is classified with a single C-level match and the
+# winning alternative is read off Match.lastgroup, so the per-line state
+# machine runs inside the regex engine instead of in Python.
+_MASTER = _re.compile(
+    r'\d+\.\s+(?P<qtext>.+)$'                                   # 1. question
+    r'|(?P<mcflag>\*?)(?P<mcletter>[a-z])\)\s+(?P<mctext>.+)$'   # a) / *b) choice
+    r'|\[(?P<maflag>.?)\]\s+(?P<matext>.+)$'                     # [ ] / [*] choice
+    r'|=\s+(?P<numval>.+)$'                                      # = numerical answer
+    r'|\*\s+(?P<shorttext>.+)$'                                  # * short answer
+    r'|(?P<essay>_{3,})'                                         # ___ essay
+    r'|(?P<fileup>\^{3,})'                                       # ^^^ file upload
+    r'|(?P<meta>(?i:quiz\ title|quiz\ description|multiple\ attempts):.*)$'
+)
+
+# Token sets for true/false handling. Exact-token membership is O(1) and,
+# unlike the old substring checks, cannot misread answers such as "not
+# applicable" as false.
+_FALSE_TOKENS = frozenset({'false', 'no', 'f', 'n'})
+_TF_PAIR = frozenset({'true', 'false'})
+_YN_PAIR = frozenset({'yes', 'no'})
+
+# Shared fragments of the New Quiz item payloads. These are static across
+# questions, so build them once instead of re-allocating the nested dicts
+# for every item POST. They are shared read-only - never mutate them.
+_SHUFFLE_RULES = {
+    "choices": {
+        "toLock": [],
+        "shuffled": False
+    }
+}
+_ESSAY_INTERACTION = {
+    "rce": True,
+    "essay": None,
+    "word_count": True,
+    "file_upload": False,
+    "spell_check": True,
+    "word_limit_enabled": False
+}
+_TF_INTERACTION = {
+    "true_choice": "True",
+    "false_choice": "False"
+}
+
+
+def _wrap(text: str) -> str:
+    """Wrap text in a paragraph, escaping HTML special characters once."""
+    return f"<p>{html.escape(text, quote=False)}</p>"
+
+
+def _choice_ids(count: int) -> List[str]:
+    """
+    Generate compact random ids for a question's choices.
+
+    One urandom call covers the whole question, and the 32-char hex form
+    skips uuid's hyphenated formatting (Canvas accepts either form).
+    """
+    rnd = os.urandom(16 * count)
+    return [rnd[i * 16:(i + 1) * 16].hex() for i in range(count)]
+
+
+def _build_choice_entry(item_body: str, choice_data: List[Dict[str, Any]],
+                        correct_choice_id: Optional[str], title: str = "Question") -> Dict[str, Any]:
+    """Build the entry payload for a multiple choice item."""
+    return {
+        "interaction_type_slug": "choice",
+        "title": title,
+        "item_body": item_body,
+        "calculator_type": "none",
+        "interaction_data": {
+            "choices": choice_data
+        },
+        "properties": {
+            "shuffleRules": _SHUFFLE_RULES,
+            "varyPointsByAnswer": False
+        },
+        "scoring_data": {
+            "value": correct_choice_id
+        },
+        "scoring_algorithm": "Equivalence"
+    }
+
+
+def _build_multi_answer_entry(item_body: str, choice_data: List[Dict[str, Any]],
+                              correct_choice_ids: List[str]) -> Dict[str, Any]:
+    """Build the entry payload for a multiple answer item."""
+    return {
+        "interaction_type_slug": "multi-answer",
+        "title": "Question",
+        "item_body": item_body,
+        "calculator_type": "none",
+        "interaction_data": {
+            "choices": choice_data
+        },
+        "properties": {
+            "shuffleRules": _SHUFFLE_RULES
+        },
+        "scoring_data": {
+            "value": correct_choice_ids
+        },
+        "scoring_algorithm": "AllOrNothing"
+    }
+
+
+def _build_true_false_entry(item_body: str, correct_answer: bool) -> Dict[str, Any]:
+    """Build the entry payload for a true/false item."""
+    return {
+        "interaction_type_slug": "true-false",
+        "title": "Question",
+        "item_body": item_body,
+        "calculator_type": "none",
+        "interaction_data": _TF_INTERACTION,
+        "properties": {},
+        "scoring_data": {
+            "value": correct_answer
+        },
+        "scoring_algorithm": "Equivalence"
+    }
+
+
+def _build_essay_entry(item_body: str) -> Dict[str, Any]:
+    """Build the entry payload for an essay item."""
+    return {
+        "interaction_type_slug": "essay",
+        "title": "Question",
+        "item_body": item_body,
+        "calculator_type": "none",
+        "interaction_data": _ESSAY_INTERACTION,
+        "properties": {},
+        "scoring_data": {
+            "value": ""
+        },
+        "scoring_algorithm": "None"
+    }
+
 
 class Text2QtiParser:
     """
@@ -51,7 +213,8 @@ class Text2QtiParser:
         self.quiz_description = ""
         self.multiple_attempts = ""
         self.questions = []
-    
+        self.total_points = 0.0
+
     def parse_file(self, file_path: str) -> Dict[str, Any]:
         """
         Parse a text2qti format file.
@@ -62,168 +225,168 @@ class Text2QtiParser:
         Returns:
             Dict containing quiz metadata and questions
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return self.parse_content(content)
-    
+        with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+            return self.parse_stream(f)
+
+    def parse_stream(self, stream) -> Dict[str, Any]:
+        """
+        Parse text2qti format content from an open text stream.
+
+        Args:
+            stream: Readable text stream of text2qti content
+
+        Returns:
+            Dict containing quiz metadata and questions
+        """
+        return self.parse_lines(stream)
+
     def parse_content(self, content: str) -> Dict[str, Any]:
         """
         Parse text2qti format content.
-        
+
         Args:
             content: Text content in text2qti format
-            
+
+        Returns:
+            Dict containing quiz metadata and questions
+        """
+        return self.parse_lines(content.splitlines())
+
+    def parse_lines(self, lines: Iterable[str]) -> Dict[str, Any]:
+        """
+        Parse text2qti content from an iterable of lines.
+
+        Processes the input in a single pass and only keeps the question
+        currently being assembled in memory, so arbitrarily large files
+        (or streams) parse in bounded space.
+
+        Args:
+            lines: Iterable of text2qti lines (trailing newlines are fine)
+
         Returns:
             Dict containing quiz metadata and questions
         """
-        lines = content.split('\n')
         self.questions = []
-        
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
-            
+        self.total_points = 0.0
+        question = None
+        # Bind the classifier to a local so the per-line loop skips the
+        # global and attribute lookups
+        master_match = _MASTER.match
+
+        for raw in lines:
+            line = raw.strip()
+
             # Skip empty lines and comments
             if not line or line.startswith('%'):
-                i += 1
                 continue
-            
-            # Parse quiz settings
-            if line.lower().startswith('quiz title:'):
-                self.quiz_title = line.split(':', 1)[1].strip()
-                
-            if line.lower().startswith('quiz description:'):
-                self.quiz_description = line.split(':', 1)[1].strip()
-
-            if line.lower().startswith('multiple attempts:'):
-                self.multiple_attempts = line.split(':', 1)[1].strip()
-
-            # Parse questions (start with number followed by period)
-            if re.match(r'^\d+\.\s+', line):
-                question, next_i = self._parse_question(lines, i)
-                if question:
-                    self.questions.append(question)
-                i = next_i
+
+            # One master-regex match classifies the line; unrecognized
+            # lines are ignored
+            match = master_match(line)
+            if match is None:
                 continue
-            
-            i += 1
-        
+            kind = match.lastgroup
+
+            # New question (number followed by period) closes out the
+            # previous one
+            if kind == 'qtext':
+                self._finish_question(question)
+                question = self._start_question(match.group('qtext'))
+                continue
+
+            if question is None:
+                # Parse quiz settings; these only appear before the first
+                # question
+                if kind == 'meta':
+                    # Only the short setting key needs case folding; the
+                    # line itself is never lowercased
+                    key, _, value = line.partition(':')
+                    key = key.lower()
+                    if key == 'quiz title':
+                        self.quiz_title = value.strip()
+                    elif key == 'quiz description':
+                        self.quiz_description = value.strip()
+                    elif key == 'multiple attempts':
+                        self.multiple_attempts = value.strip()
+                continue
+
+            self._apply_match(question, kind, match)
+
+        self._finish_question(question)
+
         return {
             'title': self.quiz_title,
             'description': self.quiz_description,
             'multiple_attempts' : self.multiple_attempts,
-            'questions': self.questions
+            'questions': self.questions,
+            'total_points': self.total_points
         }
-    
-    def _parse_question(self, lines: List[str], start_idx: int) -> Tuple[Optional[Dict[str, Any]], int]:
-        """
-        Parse a single question starting at the given line index.
-        
-        Args:
-            lines: List of all lines in the file
-            start_idx: Index where the question starts
-            
-        Returns:
-            Tuple of (question_dict, next_line_index)
-        """
-        question_line = lines[start_idx].strip()
-        question_match = re.match(r'^\d+\.\s+(.+)', question_line)
-        if not question_match:
-            return None, start_idx + 1
-        
-        question_text = question_match.group(1)
-        question = {
+
+    def _start_question(self, question_text: str) -> Dict[str, Any]:
+        """Begin a new question dict from its numbered header text."""
+        logger.debug("parsed question: %s", question_text)
+        return {
             'text': question_text,
             'type': 'multiple_choice',  # Default type
             'choices': [],
             'points': 1.0
         }
-        print(question_text)
-        i = start_idx + 1
-        
-        # Look for choices and determine question type
-        while i < len(lines):
-            line = lines[i].strip()
-            
-            # Stop if we hit another question or empty line followed by question
-            if re.match(r'^\d+\.\s+', line):
-                break
-            
+
+    def _apply_match(self, question: Dict[str, Any], kind: str, match: 're.Match') -> None:
+        """Fold one classified body line into the question being assembled."""
+        if kind == 'mctext':
             # Multiple choice options (a), b), *c))
-            choice_match = re.match(r'^(\*?)([a-z])\)\s+(.+)', line)
-            if choice_match:
-                is_correct = choice_match.group(1) == '*'
-                choice_text = choice_match.group(3)
-                question['choices'].append({
-                    'text': choice_text,
-                    'correct': is_correct
-                })
-                question['type'] = 'multiple_choice'
-                i += 1
-                continue
-            
+            question['choices'].append({
+                'text': match.group('mctext'),
+                'correct': match.group('mcflag') == '*'
+            })
+            question['type'] = 'multiple_choice'
+
+        elif kind == 'matext':
             # Multiple answer options ([ ], [*])
-            multi_choice_match = re.match(r'^\[(.?)\]\s+(.+)', line)
-            if multi_choice_match:
-                is_correct = False
-                is_correct = multi_choice_match.group(1) == '*'
-                choice_text = multi_choice_match.group(2)
-                question['choices'].append({
-                    'text': choice_text,
-                    'correct': is_correct
-                })
-                question['type'] = 'multiple_answer'
-                i += 1
-                continue
-            
+            question['choices'].append({
+                'text': match.group('matext'),
+                'correct': match.group('maflag') == '*'
+            })
+            question['type'] = 'multiple_answer'
+
+        elif kind == 'numval':
             # Numerical answer (= value)
-            numerical_match = re.match(r'^=\s+(.+)', line)
-            if numerical_match:
-                answer = numerical_match.group(1).strip()
-                question['type'] = 'numerical'
-                question['answer'] = answer
-                i += 1
-                continue
-            
+            question['type'] = 'numerical'
+            question['answer'] = match.group('numval').strip()
+
+        elif kind == 'shorttext':
             # Short answer (* answer)
-            short_answer_match = re.match(r'^\*\s+(.+)', line)
-            if short_answer_match:
-                if 'answers' not in question:
-                    question['answers'] = []
-                question['answers'].append(short_answer_match.group(1))
-                question['type'] = 'short_answer'
-                i += 1
-                continue
-            
+            if 'answers' not in question:
+                question['answers'] = []
+            question['answers'].append(match.group('shorttext'))
+            question['type'] = 'short_answer'
+
+        elif kind == 'essay':
             # Essay question indicator (three or more underscores)
-            if re.match(r'^_{3,}', line):
-                question['type'] = 'essay'
-                i += 1
-                continue
-            
+            question['type'] = 'essay'
+
+        elif kind == 'fileup':
             # File upload indicator (three or more circumflex)
-            if re.match(r'^\^{3,}', line):
-                question['type'] = 'file_upload'
-                i += 1
-                continue
-            
-            # Skip empty lines within a question
-            if not line:
-                i += 1
-                continue
-            
-            # If we don't recognize the line, move to next
-            i += 1
-        
-        # Auto-detect true/false questions
+            question['type'] = 'file_upload'
+
+    def _finish_question(self, question: Optional[Dict[str, Any]]) -> None:
+        """Finalize a completed question and record it."""
+        if question is None:
+            return
+
+        # Auto-detect true/false questions - exactly two choices, so build
+        # the comparison set directly
         if question['type'] == 'multiple_choice' and len(question['choices']) == 2:
-            choice_texts = [choice['text'].lower() for choice in question['choices']]
-            if ('true' in choice_texts and 'false' in choice_texts) or \
-               ('yes' in choice_texts and 'no' in choice_texts):
+            texts = {
+                question['choices'][0]['text'].strip().lower(),
+                question['choices'][1]['text'].strip().lower()
+            }
+            if texts == _TF_PAIR or texts == _YN_PAIR:
                 question['type'] = 'true_false'
-        
-        return question, i
+
+        self.total_points += question['points']
+        self.questions.append(question)
 
 
 class CanvasQuizCreator:
@@ -241,6 +404,28 @@ class CanvasQuizCreator:
             'Authorization': f'Bearer {api_token}',
             'Content-Type': 'application/json'
         }
+        # One session for all API calls so every question POST reuses the
+        # same TCP/TLS connection instead of paying a handshake per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('https://', adapter)
+        # Question-type dispatch table; unsupported types fall back to
+        # multiple choice in create_question_from_parsed
+        self._question_builders = {
+            'multiple_choice': self._create_multiple_choice_question,
+            'multiple_answer': self._create_multiple_answer_question,
+            'true_false': self._create_true_false_question,
+            'essay': self._create_essay_question,
+        }
     
     def create_quiz(self, course_id: int, quiz_title: str, instructions: str = "", 
                    points_possible: float = None, **quiz_settings) -> Dict[str, Any]:
@@ -271,10 +456,9 @@ class CanvasQuizCreator:
             quiz_data["quiz"]["points_possible"] = points_possible
         
         # Add any additional quiz settings
-        for key, value in quiz_settings.items():
-            quiz_data["quiz"][key] = value
+        quiz_data["quiz"].update(quiz_settings)
         
-        response = requests.post(url, headers=self.headers, json=quiz_data)
+        response = self.session.post(url, data=_json_dumps(quiz_data))
         response.raise_for_status()
         
         return response.json()
@@ -294,225 +478,102 @@ class CanvasQuizCreator:
             Dict containing the created question data
         """
         question_type = question_data.get('type', 'multiple_choice')
-        
-        if question_type == 'multiple_choice':
-            return self._create_multiple_choice_question(
-                course_id, assignment_id, question_data, position
-            )
-        elif question_type == 'multiple_answer':
-            return self._create_multiple_answer_question(
-                course_id, assignment_id, question_data, position
-            )
-        elif question_type == 'true_false':
-            return self._create_true_false_question(
-                course_id, assignment_id, question_data, position
-            )
-        elif question_type == 'essay':
-            return self._create_essay_question(
-                course_id, assignment_id, question_data, position
-            )
-        else:
+
+        builder = self._question_builders.get(question_type)
+        if builder is None:
             # Default to multiple choice for unsupported types
             print(f"Warning: Question type '{question_type}' not fully supported, creating as multiple choice")
-            return self._create_multiple_choice_question(
-                course_id, assignment_id, question_data, position
-            )
-    
-    def _create_multiple_choice_question(self, course_id: int, assignment_id: int, 
-                                       question_data: Dict[str, Any], position: int = None) -> Dict[str, Any]:
-        """Create a multiple choice question."""
+            builder = self._create_multiple_choice_question
+
+        return builder(course_id, assignment_id, question_data, position)
+
+    def _post_item(self, course_id: int, assignment_id: int, entry: Dict[str, Any],
+                   points: float, position: Optional[int] = None) -> Dict[str, Any]:
+        """
+        POST one quiz item entry to Canvas and return the created item.
+
+        All question types share the same envelope, endpoint, and
+        serialization, so the request layer lives here in one place.
+        """
         url = f"{self.canvas_url}/api/quiz/v1/courses/{course_id}/quizzes/{assignment_id}/items"
-        
-        # Generate UUIDs for choices
-        choice_data = []
-        correct_choice_id = None
-        
-        for i, choice in enumerate(question_data['choices']):
-            choice_id = str(uuid.uuid4())
-            choice_data.append({
-                "id": choice_id,
-                "position": i + 1,
-                "itemBody": f"<p>{choice['text']}</p>"
-            })
-            
-            if choice.get('correct', False):
-                correct_choice_id = choice_id
-        
+
         item_data = {
             "item": {
                 "entry_type": "Item",
-                "points_possible": question_data.get('points', 1.0),
-                "entry": {
-                    "interaction_type_slug": "choice",
-                    "title": f"Question",
-                    "item_body": f"<p>{question_data['text']}</p>",
-                    "calculator_type": "none",
-                    "interaction_data": {
-                        "choices": choice_data
-                    },
-                    "properties": {
-                        "shuffleRules": {
-                            "choices": {
-                                "toLock": [],
-                                "shuffled": False
-                            }
-                        },
-                        "varyPointsByAnswer": False
-                    },
-                    "scoring_data": {
-                        "value": correct_choice_id
-                    },
-                    "scoring_algorithm": "Equivalence"
-                }
+                "points_possible": points,
+                "entry": entry
             }
         }
-        
+
         if position is not None:
             item_data["item"]["position"] = position
-        
-        response = requests.post(url, headers=self.headers, json=item_data)
+
+        response = self.session.post(url, data=_json_dumps(item_data))
         response.raise_for_status()
-        
+
         return response.json()
     
+    def _create_multiple_choice_question(self, course_id: int, assignment_id: int, 
+                                       question_data: Dict[str, Any], position: int = None) -> Dict[str, Any]:
+        """Create a multiple choice question."""
+        # Generate ids for choices and build their bodies in one pass
+        choice_ids = _choice_ids(len(question_data['choices']))
+        choice_data = [
+            {"id": choice_ids[i], "position": i + 1, "itemBody": _wrap(choice['text'])}
+            for i, choice in enumerate(question_data['choices'])
+        ]
+        correct_choice_id = None
+        for choice_id, choice in zip(choice_ids, question_data['choices']):
+            if choice.get('correct', False):
+                correct_choice_id = choice_id
+
+        entry = _build_choice_entry(
+            _wrap(question_data['text']), choice_data, correct_choice_id
+        )
+        return self._post_item(course_id, assignment_id, entry,
+                               question_data.get('points', 1.0), position)
+    
     def _create_multiple_answer_question(self, course_id: int, assignment_id: int, 
                                        question_data: Dict[str, Any], position: int = None) -> Dict[str, Any]:
         """Create a multiple answer question."""
-        url = f"{self.canvas_url}/api/quiz/v1/courses/{course_id}/quizzes/{assignment_id}/items"
-        
-        # Generate UUIDs for choices
-        choice_data = []
-        correct_choice_ids = []
-        
-        for i, choice in enumerate(question_data['choices']):
-            choice_id = str(uuid.uuid4())
-            choice_data.append({
-                "id": choice_id,
-                "position": i + 1,
-                "itemBody": f"<p>{choice['text']}</p>"
-            })
-            
-            if choice.get('correct', False):
-                correct_choice_ids.append(choice_id)
-        
-        item_data = {
-            "item": {
-                "entry_type": "Item",
-                "points_possible": question_data.get('points', 1.0),
-                "entry": {
-                    "interaction_type_slug": "multi-answer",
-                    "title": f"Question",
-                    "item_body": f"<p>{question_data['text']}</p>",
-                    "calculator_type": "none",
-                    "interaction_data": {
-                        "choices": choice_data
-                    },
-                    "properties": {
-                        "shuffleRules": {
-                            "choices": {
-                                "toLock": [],
-                                "shuffled": False
-                            }
-                        }
-                    },
-                    "scoring_data": {
-                        "value": correct_choice_ids
-                    },
-                    "scoring_algorithm": "AllOrNothing"
-                }
-            }
-        }
-        
-        if position is not None:
-            item_data["item"]["position"] = position
-        
-        response = requests.post(url, headers=self.headers, json=item_data)
-        response.raise_for_status()
-        
-        return response.json()
+        # Generate ids for choices and build their bodies in one pass
+        choice_ids = _choice_ids(len(question_data['choices']))
+        choice_data = [
+            {"id": choice_ids[i], "position": i + 1, "itemBody": _wrap(choice['text'])}
+            for i, choice in enumerate(question_data['choices'])
+        ]
+        correct_choice_ids = [
+            choice_id
+            for choice_id, choice in zip(choice_ids, question_data['choices'])
+            if choice.get('correct', False)
+        ]
+
+        entry = _build_multi_answer_entry(
+            _wrap(question_data['text']), choice_data, correct_choice_ids
+        )
+        return self._post_item(course_id, assignment_id, entry,
+                               question_data.get('points', 1.0), position)
     
     def _create_true_false_question(self, course_id: int, assignment_id: int, 
                                   question_data: Dict[str, Any], position: int = None) -> Dict[str, Any]:
         """Create a true/false question."""
-        url = f"{self.canvas_url}/api/quiz/v1/courses/{course_id}/quizzes/{assignment_id}/items"
-        
         # Determine the correct answer
         correct_answer = True
         for choice in question_data['choices']:
             if choice.get('correct', False):
-                choice_text = choice['text'].lower()
-                if 'false' in choice_text or 'no' in choice_text:
-                    correct_answer = False
+                correct_answer = choice['text'].strip().lower() not in _FALSE_TOKENS
                 break
-        
-        item_data = {
-            "item": {
-                "entry_type": "Item",
-                "points_possible": question_data.get('points', 1.0),
-                "entry": {
-                    "interaction_type_slug": "true-false",
-                    "title": f"Question",
-                    "item_body": f"<p>{question_data['text']}</p>",
-                    "calculator_type": "none",
-                    "interaction_data": {
-                        "true_choice": "True",
-                        "false_choice": "False"
-                    },
-                    "properties": {},
-                    "scoring_data": {
-                        "value": correct_answer
-                    },
-                    "scoring_algorithm": "Equivalence"
-                }
-            }
-        }
-        
-        if position is not None:
-            item_data["item"]["position"] = position
-        
-        response = requests.post(url, headers=self.headers, json=item_data)
-        response.raise_for_status()
-        
-        return response.json()
+
+        entry = _build_true_false_entry(_wrap(question_data['text']), correct_answer)
+        return self._post_item(course_id, assignment_id, entry,
+                               question_data.get('points', 1.0), position)
     
     def _create_essay_question(self, course_id: int, assignment_id: int, 
                              question_data: Dict[str, Any], position: int = None) -> Dict[str, Any]:
         """Create an essay question."""
-        url = f"{self.canvas_url}/api/quiz/v1/courses/{course_id}/quizzes/{assignment_id}/items"
-        
-        item_data = {
-            "item": {
-                "entry_type": "Item",
-                "points_possible": question_data.get('points', 1.0),
-                "entry": {
-                    "interaction_type_slug": "essay",
-                    "title": f"Question",
-                    "item_body": f"<p>{question_data['text']}</p>",
-                    "calculator_type": "none",
-                    "interaction_data": {
-                        "rce": True,
-                        "essay": None,
-                        "word_count": True,
-                        "file_upload": False,
-                        "spell_check": True,
-                        "word_limit_enabled": False
-                    },
-                    "properties": {},
-                    "scoring_data": {
-                        "value": ""
-                    },
-                    "scoring_algorithm": "None"
-                }
-            }
-        }
-        
-        if position is not None:
-            item_data["item"]["position"] = position
-        
-        response = requests.post(url, headers=self.headers, json=item_data)
-        response.raise_for_status()
-        
-        return response.json()
+        entry = _build_essay_entry(_wrap(question_data['text']))
+        return self._post_item(course_id, assignment_id, entry,
+                               question_data.get('points', 1.0), position)
 
     def create_multiple_choice_question(self, course_id: int, assignment_id: int, 
                                       question_text: str, choices: List[Dict[str, Any]], 
@@ -534,59 +595,21 @@ class CanvasQuizCreator:
         Returns:
             Dict containing the created question data
         """
-        url = f"{self.canvas_url}/api/quiz/v1/courses/{course_id}/quizzes/{assignment_id}/items"
-        
-        # Generate UUIDs for choices
-        choice_data = []
+        # Generate ids for choices and build their bodies in one pass
+        choice_ids = _choice_ids(len(choices))
+        choice_data = [
+            {"id": choice_ids[i], "position": i + 1, "itemBody": _wrap(choice['text'])}
+            for i, choice in enumerate(choices)
+        ]
         correct_choice_id = None
-        
-        for i, choice in enumerate(choices):
-            choice_id = str(uuid.uuid4())
-            choice_data.append({
-                "id": choice_id,
-                "position": i + 1,
-                "itemBody": f"<p>{choice['text']}</p>"
-            })
-            
-            if i == correct_answer_index:
-                correct_choice_id = choice_id
-        
-        item_data = {
-            "item": {
-                "entry_type": "Item",
-                "points_possible": points,
-                "entry": {
-                    "interaction_type_slug": "choice",
-                    "title": title or f"Question",
-                    "item_body": f"<p>{question_text}</p>",
-                    "calculator_type": "none",
-                    "interaction_data": {
-                        "choices": choice_data
-                    },
-                    "properties": {
-                        "shuffleRules": {
-                            "choices": {
-                                "toLock": [],
-                                "shuffled": False  # Set to True if you want shuffled answers
-                            }
-                        },
-                        "varyPointsByAnswer": False
-                    },
-                    "scoring_data": {
-                        "value": correct_choice_id
-                    },
-                    "scoring_algorithm": "Equivalence"
-                }
-            }
-        }
-        
-        if position is not None:
-            item_data["item"]["position"] = position
-        
-        response = requests.post(url, headers=self.headers, json=item_data)
-        response.raise_for_status()
-        
-        return response.json()
+        if 0 <= correct_answer_index < len(choice_ids):
+            correct_choice_id = choice_ids[correct_answer_index]
+
+        entry = _build_choice_entry(
+            _wrap(question_text), choice_data, correct_choice_id,
+            title=title or "Question"
+        )
+        return self._post_item(course_id, assignment_id, entry, points, position)
 
 
 def create_quiz_from_text2qti_file(file_path: str, course_id: int, canvas_url: str, api_token: str) -> Dict[str, Any]:
@@ -610,9 +633,9 @@ def create_quiz_from_text2qti_file(file_path: str, course_id: int, canvas_url: s
     # Initialize quiz creator
     quiz_creator = CanvasQuizCreator(canvas_url, api_token)
     
-    # Calculate total points
-    total_points = sum(q.get('points', 1.0) for q in quiz_data['questions'])
-    
+    # Total points were accumulated while parsing, no second pass needed
+    total_points = quiz_data['total_points']
+
     # Create the quiz
     quiz = quiz_creator.create_quiz(
         course_id=course_id,
@@ -625,20 +648,31 @@ def create_quiz_from_text2qti_file(file_path: str, course_id: int, canvas_url: s
     print(f"Quiz '{quiz_data['title']}' created successfully! Quiz ID: {quiz['id']}")
     assignment_id = quiz['id']
     
-    # Add questions
-    created_questions = []
-    for i, question_data in enumerate(quiz_data['questions'], 1):
-        try:
-            question = quiz_creator.create_question_from_parsed(
+    # Add questions concurrently - each POST is an independent round trip, so
+    # overlapping them through a bounded pool hides most of the network
+    # latency. Positions are passed explicitly, so ordering in Canvas does
+    # not depend on completion order.
+    results = {}
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        futures = {
+            executor.submit(
+                quiz_creator.create_question_from_parsed,
                 course_id=course_id,
                 assignment_id=assignment_id,
                 question_data=question_data,
                 position=i
-            )
-            created_questions.append(question)
-            print(f"Question {i} ({question_data['type']}) created successfully!")
-        except Exception as e:
-            print(f"Error creating question {i}: {e}")
+            ): (i, question_data)
+            for i, question_data in enumerate(quiz_data['questions'], 1)
+        }
+        for future in as_completed(futures):
+            i, question_data = futures[future]
+            try:
+                results[i] = future.result()
+                print(f"Question {i} ({question_data['type']}) created successfully!")
+            except Exception as e:
+                print(f"Error creating question {i}: {e}")
+
+    created_questions = [results[i] for i in sorted(results)]
     
     return {
         'quiz': quiz,
@@ -1,79 +1,197 @@
-import json
+import logging
+import logging.handlers
 import os
-import time
+import queue
+import threading
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict
+from requests.adapters import HTTPAdapter, Retry
 from canvasapi import Canvas
-from canvasapi.course import Course
-from canvasapi.module import Module
-from canvasapi.page import Page
-from dotenv import load_dotenv
+from canvasapi.module import ModuleItem
 
-def download_course_modules(canvas, course, download_dir="downloads") -> List[Dict]:
+# Characters that are unsafe in filenames, compiled once instead of on
+# every make_sortable_filename call
+_SANITIZE_RE = re.compile(r'[ <>:"/\\|?*]+')
+
+# Worker threads log through this; main() attaches a QueueHandler so the
+# workers never block on terminal writes
+logger = logging.getLogger('canvas_dl')
+
+
+def configure_logging():
+    """Route log records through a queue drained by a background listener.
+
+    Download workers enqueue records (a lock-free fast path) and a single
+    QueueListener thread does the actual terminal I/O, so slow console
+    writes never stall a download thread. Returns the listener; the
+    caller stops it on exit to flush remaining records.
+    """
+    log_queue = queue.Queue(-1)
+    console = logging.StreamHandler()
+    console.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, console)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    listener.start()
+    return listener
+
+def mount_pooled_adapter(canvas):
+    """Pool connections on canvasapi's internal session.
+
+    Every module listing, file-metadata fetch, and file download goes
+    through this one session, so keep-alive amortizes the TCP/TLS
+    handshake across the whole run and transient 429/5xx responses are
+    retried with backoff. Returns the session for direct reuse.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504]
+        )
+    )
+    session = canvas._Canvas__requester._session
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def download_course_modules(canvas, course, download_dir="downloads", max_workers=16) -> List[Dict]:
     """Download all module items from a course using canvasapi"""
-    
-    # Create download directory
+
+    # Create download directory; keep the plain string around so the
+    # per-item hot path joins with os.path instead of allocating a
+    # PurePath per file
+    download_dir = os.fspath(download_dir)
     Path(download_dir).mkdir(parents=True, exist_ok=True)
 
-    # Get all modules with their items
-    modules = course.get_modules(include=['items'])
-    
+    # Get all modules with their items; content_details inlines each
+    # file's display_name/size so most files need no metadata fetch, and
+    # per_page=100 pulls the whole list in one page for most courses
+    # instead of paginating in tens
+    modules = course.get_modules(include=['items', 'content_details'], per_page=100)
+
     all_items = []
-    
-    for module in modules:
-        module_id = getattr(module, 'id', 0)
-        module_name = getattr(module, 'name', 'Unknown Module')
-        print(f"\nProcessing Module {module_id}: {module_name}")
-        
-        # Get module items
-        items = module.get_module_items()
-        
-        allowed_types = ['File','Attachment','Page']
-        items_to_download = [
-            item for item in items 
-            if getattr(item, 'type', '') in allowed_types and getattr(item, 'published', False)
-        ]
-        all_items.extend(items_to_download)
-
-        for item in items_to_download:
-            item_type = getattr(item, 'type', '')
-            title = getattr(item, 'title', 'untitled')
-            position = getattr(item, 'position', 0)
-            
-            print(f"  Processing: {title} (Type: {item_type}, Position: {position})")
-            
-            try:
-                if item_type == 'File':
-                    download_file(item, module, course, canvas, download_dir, module_id, position)
-                    
-                elif item_type == 'Page':
-                    download_page(item, module, course, canvas, download_dir, module_id, position)
-                    
-                elif item_type == 'Attachment':
-                    download_file(item, module, course, canvas, download_dir, module_id, position)
-                    
-                else:
-                    print(f"    Skipping {item_type} - not downloadable")
-                    
-            except Exception as e:
-                print(f"    Error downloading {title}: {e}")
+
+    # Downloads are pure network I/O, so run a module's items concurrently
+    # through a bounded thread pool instead of waiting out one round trip
+    # per item
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        # Resolve every module's downloadable items up front (cheap - the
+        # items were sideloaded) so each module's downloads can overlap
+        # with metadata prefetch for the module after it
+        module_batches = []
+        for module in modules:
+            # Items were already sideloaded by get_modules(include=['items']),
+            # so reuse them instead of paying another round trip per module;
+            # Canvas omits the sideload for very large modules, so keep
+            # get_module_items as the fallback
+            raw_items = getattr(module, 'items', None)
+            if raw_items is not None:
+                items = [ModuleItem(module._requester, raw) for raw in raw_items]
+            else:
+                items = module.get_module_items(include=['content_details'], per_page=100)
+
+            allowed_types = ['File','Attachment','Page']
+            items_to_download = [
+                item for item in items
+                if getattr(item, 'type', '') in allowed_types and getattr(item, 'published', False)
+            ]
+            all_items.extend(items_to_download)
+            module_batches.append((module, items_to_download))
+
+        # Futures for canvas.get_file metadata, keyed by content_id;
+        # download_file consumes these instead of fetching synchronously
+        file_futures = {}
+
+        # Local paths of completed downloads keyed by content_id - a file
+        # referenced from several modules is fetched once and linked into
+        # its other locations
+        downloaded = {}
+
+        def prefetch_file_metadata(items):
+            for item in items:
+                if getattr(item, 'type', '') in ('File', 'Attachment'):
+                    # content_details already carries the filename and
+                    # size, so only files missing the sideload need a
+                    # get_file round trip up front
+                    details = getattr(item, 'content_details', None) or {}
+                    if details.get('display_name'):
+                        continue
+                    content_id = getattr(item, 'content_id', None)
+                    if content_id is not None and content_id not in file_futures:
+                        file_futures[content_id] = pool.submit(canvas.get_file, content_id)
+
+        # Module batches are independent, so submit every module's downloads
+        # to the one pool instead of draining the pool between modules;
+        # metadata futures are queued ahead of the items that consume them
+        futures = []
+        for module, items_to_download in module_batches:
+            module_id = getattr(module, 'id', 0)
+            module_name = getattr(module, 'name', 'Unknown Module')
+            logger.info("\nProcessing Module %s: %s", module_id, module_name)
+
+            # Sanitize/truncate the module title once here rather than
+            # once per item inside make_sortable_filename
+            module_prefix = make_module_prefix(module_name, getattr(module, 'position', 0))
+
+            prefetch_file_metadata(items_to_download)
+            futures.extend(
+                pool.submit(download_item, item, module, course, canvas,
+                            download_dir, module_prefix, file_futures, downloaded)
+                for item in items_to_download
+            )
+
+        for future in as_completed(futures):
+            future.result()
     return all_items
-    
-def make_sortable_filename(title, module_title, module_position, position, extension=""):
+
+def download_item(item, module, course, canvas, download_dir, module_prefix, file_futures=None, downloaded=None):
+    """Download a single module item, dispatching on its type"""
+    # canvasapi populates these straight from the API JSON; one guarded
+    # unpack replaces repeated getattr-with-default dispatches
+    try:
+        item_type, title, position = item.type, item.title, item.position
+    except AttributeError:
+        logger.info("    Skipping item with incomplete metadata: %s", item)
+        return
+
+    logger.info("  Processing: %s (Type: %s, Position: %s)", title, item_type, position)
+
+    try:
+        if item_type == 'File':
+            download_file(item, module, course, canvas, download_dir, module_prefix, position, file_futures, downloaded)
+
+        elif item_type == 'Page':
+            download_page(item, module, course, canvas, download_dir, module_prefix, position)
+
+        elif item_type == 'Attachment':
+            download_file(item, module, course, canvas, download_dir, module_prefix, position, file_futures, downloaded)
+
+        else:
+            logger.info("    Skipping %s - not downloadable", item_type)
+
+    except Exception as e:
+        logger.info("    Error downloading %s: %s", title, e)
+
+def make_module_prefix(module_title, module_position):
+    """Build the sortable filename prefix shared by a module's items"""
+    safe_module_title = _SANITIZE_RE.sub('_', module_title)
+    truncated_module_title = safe_module_title[:25]
+    return f"{module_position:03d}_{truncated_module_title}"
+
+def make_sortable_filename(title, module_prefix, position, extension=""):
     """Create filename that will sort in module order"""
 
     basefilename, ogextension = os.path.splitext(title)
     extension = extension if extension else ogextension
-    safe_title = re.sub(r'[ <>:"/\\|?*]+', '_', basefilename)
+    safe_title = _SANITIZE_RE.sub('_', basefilename)
     safe_title = safe_title.strip()
-    
-    safe_module_title = re.sub(r'[ <>:"/\\|?*]+', '_', module_title)
-    truncated_module_title = safe_module_title[:25]
-    safe_module_title = safe_module_title.strip()
-
 
-    prefix = f"{module_position:03d}_{truncated_module_title}_{position:03d}"
+    prefix = f"{module_prefix}_{position:03d}"
     base_name = f"{prefix}_{safe_title}"
     
     if len(base_name) > 200:
@@ -82,43 +200,159 @@ def make_sortable_filename(title, module_title, module_position, position, exten
     
     return f"{base_name}{extension}"
 
-def download_file(item, module, course, canvas, download_dir, module_id, position):
+def _pipelined_copy(src, dst, length=1024 * 1024):
+    """Copy src to dst, reading the next chunk while the last one flushes.
+
+    A writer thread fed through a two-slot queue overlaps socket reads
+    with disk writes, so a file costs roughly max(network, disk) time
+    instead of their sum. Write errors are re-raised in the caller.
+    """
+    chunks = queue.Queue(maxsize=2)
+    error = []
+
+    def writer():
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                return
+            # Keep draining after a failure so the reader never blocks
+            # on a full queue
+            if not error:
+                try:
+                    dst.write(chunk)
+                except Exception as exc:
+                    error.append(exc)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        while not error:
+            chunk = src.read(length)
+            if not chunk:
+                break
+            chunks.put(chunk)
+    finally:
+        chunks.put(None)
+        thread.join()
+    if error:
+        raise error[0]
+
+def resolve_file_obj(content_id, canvas, file_futures=None):
+    """Fetch file metadata, preferring a prefetched future when one exists"""
+    future = file_futures.get(content_id) if file_futures else None
+    return future.result() if future is not None else canvas.get_file(content_id)
+
+# One lock per content_id so concurrent occurrences of the same file
+# serialize: the first fetches the body, later ones find it registered
+# in the downloaded map and link to it
+_content_locks = {}
+_content_locks_mutex = threading.Lock()
+
+def _content_lock(content_id):
+    with _content_locks_mutex:
+        lock = _content_locks.get(content_id)
+        if lock is None:
+            lock = _content_locks[content_id] = threading.Lock()
+        return lock
+
+def download_file(item, module, course, canvas, download_dir, module_prefix, position, file_futures=None, downloaded=None):
     """Download a file using canvasapi"""
-    content_id = getattr(item, 'content_id', None)
-    title = getattr(item, 'title', 'untitled')
-    
+    try:
+        content_id, title = item.content_id, item.title
+    except AttributeError:
+        logger.info("    Missing content_id for file item: %s", item)
+        return
+
     if not content_id:
-        print(f"    No content_id for file: {title}")
+        logger.info("    No content_id for file: %s", title)
         return
-    
+
     try:
-        # Get the file object
-        file_obj = canvas.get_file(content_id)
-        
-        # Get original filename and extension
-        original_filename = getattr(file_obj, 'filename', title)
-        file_ext = Path(original_filename).suffix
-        content_type = getattr(file_obj, 'content-type', 'unknown')
-        print(f"---- {content_type}\t{original_filename}")
+        # The content_details sideload usually carries the filename and
+        # size inline, in which case the get_file metadata round trip is
+        # only paid when the body actually has to be downloaded
+        details = getattr(item, 'content_details', None) or {}
+        file_obj = None
+        original_filename = details.get('display_name')
+        file_size = details.get('size')
+        if original_filename is None:
+            file_obj = resolve_file_obj(content_id, canvas, file_futures)
+            original_filename = getattr(file_obj, 'filename', title)
+            file_size = getattr(file_obj, 'size', None)
+
+        file_ext = os.path.splitext(original_filename)[1]
+        content_type = details.get('content_type') or getattr(file_obj, 'content-type', 'unknown')
+        logger.info("---- %s\t%s", content_type, original_filename)
         
         # Create sortable filename
-        sortable_filename = make_sortable_filename(title, module.name, module.position, position, file_ext)
-        filepath = Path(download_dir) / sortable_filename
-        
-        # Download the file
-        file_obj.download(str(filepath))
-        print(f"    Downloaded: {sortable_filename}")
+        sortable_filename = make_sortable_filename(title, module_prefix, position, file_ext)
+        filepath = os.path.join(download_dir, sortable_filename)
+
+        # Serialize on the per-content_id lock so duplicates submitted
+        # concurrently wait for the first copy instead of each fetching
+        # their own
+        with _content_lock(content_id):
+            # If another occurrence already pulled this file, link to
+            # that copy instead of downloading the bytes again
+            if downloaded is not None:
+                existing = downloaded.get(content_id)
+                if existing and existing != filepath and os.path.exists(existing):
+                    if os.path.exists(filepath):
+                        if file_size is not None and os.path.getsize(filepath) == file_size:
+                            logger.info("    Up to date: %s", sortable_filename)
+                            return
+                        # Stale or partial copy from an interrupted run;
+                        # replace it with a link to the good copy
+                        os.remove(filepath)
+                    try:
+                        os.link(existing, filepath)
+                    except OSError:
+                        # Symlink targets resolve relative to the link's
+                        # own directory, so the target must be absolute
+                        os.symlink(os.path.abspath(existing), filepath)
+                    logger.info("    Linked duplicate: %s", sortable_filename)
+                    return
+
+            # Skip the body download when a local copy of the same size
+            # already exists - incremental re-runs then cost no per-file
+            # round trips at all when content_details supplied the size
+            if os.path.exists(filepath) and file_size is not None and os.path.getsize(filepath) == file_size:
+                if downloaded is not None:
+                    downloaded[content_id] = filepath
+                logger.info("    Up to date: %s", sortable_filename)
+                return
+
+            # The presigned body URL only comes from the file object, so
+            # resolve it now if content_details let us skip it so far
+            if file_obj is None:
+                file_obj = resolve_file_obj(content_id, canvas, file_futures)
+
+            # Stream the body straight to disk over the pooled session in
+            # 1 MiB chunks instead of canvasapi's buffered download;
+            # file_obj.url is a presigned URL, so no auth header is needed
+            session = canvas._Canvas__requester._session
+            with session.get(file_obj.url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                response.raw.decode_content = True
+                with open(filepath, 'wb') as f:
+                    _pipelined_copy(response.raw, f)
+            if downloaded is not None:
+                downloaded[content_id] = filepath
+            logger.info("    Downloaded: %s", sortable_filename)
         
     except Exception as e:
-        print(f"    Error downloading file {title}: {e}")
+        logger.info("    Error downloading file %s: %s", title, e)
 
-def download_page(item, module, course, canvas, download_dir, module_id, position):
+def download_page(item, module, course, canvas, download_dir, module_prefix, position):
         """Download page content as HTML"""
-        page_url = getattr(item, 'page_url', None)
-        title = getattr(item, 'title', 'untitled')
-        
+        try:
+            page_url, title = item.page_url, item.title
+        except AttributeError:
+            logger.info("    Missing page_url for page item: %s", item)
+            return
+
         if not page_url:
-            print(f"    No page_url for page: {title}")
+            logger.info("    No page_url for page: %s", title)
             return
         
         try:
@@ -127,11 +361,10 @@ def download_page(item, module, course, canvas, download_dir, module_id, positio
             page_content = getattr(page, 'body', '')
             
             # Create sortable filename
-            sortable_filename = make_sortable_filename(title, module.name, module.position, position, ".html")
-            filepath = Path(download_dir) / sortable_filename
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(f"""<!DOCTYPE html>
+            sortable_filename = make_sortable_filename(title, module_prefix, position, ".html")
+            filepath = os.path.join(download_dir, sortable_filename)
+
+            html_content = f"""<!DOCTYPE html>
     <html>
     <head>
         <title>{title}</title>
@@ -141,19 +374,40 @@ def download_page(item, module, course, canvas, download_dir, module_id, positio
         <h1>{title}</h1>
         {page_content}
     </body>
-    </html>""")
-            
-            print(f"    Downloaded page: {sortable_filename}")
+    </html>"""
+            payload = html_content.encode('utf-8')
+
+            # Skip the write when the rendered page is unchanged so re-runs
+            # leave file timestamps alone
+            if os.path.exists(filepath):
+                with open(filepath, 'rb') as existing:
+                    if existing.read() == payload:
+                        logger.info("    Up to date page: %s", sortable_filename)
+                        return
+
+            # Write the pre-encoded page in one low-level call, skipping the
+            # text-mode codec and buffering layers
+            fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+
+            logger.info("    Downloaded page: %s", sortable_filename)
             
         except Exception as e:
-            print(f"    Error downloading page {title}: {e}")
+            logger.info("    Error downloading page %s: %s", title, e)
 
 
 def main():
     # Configuration - replace with your actual values
-    # Load environment variables from .env file
+    # Load environment variables from .env file; imported here so the
+    # module itself stays cheap to import
+    from dotenv import load_dotenv
     load_dotenv()
-    
+
+    listener = configure_logging()
+
     # Configuration - READ FROM .env FILE
     CANVAS_URL = os.getenv("CANVAS_URL").rstrip('/')
     ACCESS_TOKEN = os.getenv("CANVAS_API_TOKEN")
@@ -161,20 +415,25 @@ def main():
     DOWNLOAD_DIR = os.getenv("DOWNLOAD_DIR")
     CONTENT_DIR = f"./{DOWNLOAD_DIR}/course_{COURSE_ID}_content"
 
-    # Initialize the Canvas API object
-    canvas = Canvas(CANVAS_URL, ACCESS_TOKEN)
-    course = canvas.get_course(COURSE_ID)
-    print(course)
-    print(f"creating {CONTENT_DIR}")
-    downloaded_items = download_course_modules(canvas,course,CONTENT_DIR)
-
-    # Extract all published pages from published modules
-    if downloaded_items:
-        print(f"\nSuccessfully extracted {len(downloaded_items)} items!")
-        for i in downloaded_items:
-            print(f"ID: {i.id}, Module: {i.module_id}, Pos: {i.position}, Type: {i.type}, Title: {i.title}")
-    else:
-        print("No pages found or error occurred.")
+    try:
+        # Initialize the Canvas API object
+        canvas = Canvas(CANVAS_URL, ACCESS_TOKEN)
+        mount_pooled_adapter(canvas)
+        course = canvas.get_course(COURSE_ID)
+        logger.info("%s", course)
+        logger.info("creating %s", CONTENT_DIR)
+        downloaded_items = download_course_modules(canvas,course,CONTENT_DIR)
+
+        # Extract all published pages from published modules
+        if downloaded_items:
+            logger.info("\nSuccessfully extracted %s items!", len(downloaded_items))
+            for i in downloaded_items:
+                logger.info("ID: %s, Module: %s, Pos: %s, Type: %s, Title: %s", i.id, i.module_id, i.position, i.type, i.title)
+        else:
+            logger.info("No pages found or error occurred.")
+    finally:
+        # Flush any records still queued before the process exits
+        listener.stop()
 
 
 if __name__ == "__main__":